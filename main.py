@@ -1,18 +1,186 @@
 import requests
-from bs4 import BeautifulSoup
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selectolax.lexbor import LexborHTMLParser
 import time
 import re
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 import sys
-import select
-from datetime import datetime
+import selectors
 import threading
 import signal
 import queue
 import os
+import logging
+import logging.handlers
+import functools
+import contextlib
+import collections
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+
+# Yes-price patterns, compiled once. A cent price is the number right before the first ¢
+# after "yes", looking past any bare numbers on the way ("yes 2 shares 45¢" -> 45); the
+# bare pattern takes the first number after "yes" and is only used when no cent price matches.
+_YES_CENT_RE = re.compile(r'yes[^¢]*?(\d+(?:\.\d+)?)¢')
+_YES_BARE_RE = re.compile(r'yes\D*(\d+(?:\.\d+)?)')
+
+# Event slug of a polymarket.com/event/<slug> URL, captured in a single pass
+_POLY_SLUG_RE = re.compile(r'polymarket\.com/event/([^/?#]+)')
+
+# Polymarket's public market data API; serves the same prices the event pages render
+GAMMA_API_URL = "https://gamma-api.polymarket.com"
+
+# Re-resolve each event's market ids every this many checks, so outcome markets added
+# to an event later are priced too (a missing leg would make the margin look positive)
+_MARKET_REFRESH_CYCLES = 10
+
+# Commands accepted at the prompt between checks (input is already stripped and lowercased)
+_TRADE_CMDS = frozenset({'trade', 'yes', 'y'})
+_QUIT_CMDS = frozenset({'quit', 'exit', 'stop'})
+
+# Shortest pause between the end of one check and the start of the next, so a scan
+# that overruns the interval doesn't start the next one back-to-back
+_MIN_IDLE_SECONDS = 10
+
+# Resolved once at import; the log file lives next to the script by default
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+LOG_PATH = os.path.join(SCRIPT_DIR, "log.txt")
+
+
+def _parse_yes_prices(content):
+    """Extract yes prices from an element's text, lowercasing it once"""
+    low = content.lower()
+    if 'yes' not in low:
+        return []
+    
+    # Prefer explicit cent prices; bare numbers only count if they look like a price
+    cent_prices = [float(value) for value in _YES_CENT_RE.findall(low)]
+    if cent_prices:
+        return cent_prices
+    return [price for price in (float(value) for value in _YES_BARE_RE.findall(low)) if 0 < price <= 100]
+
+
+def _ts(date=True):
+    """Local time as 'YYYY-MM-DD HH:MM:SS' (or just 'HH:MM:SS' when date=False).
+    
+    Formats the integer fields directly, skipping strftime's locale handling.
+    """
+    lt = time.localtime()
+    clock = f"{lt.tm_hour:02d}:{lt.tm_min:02d}:{lt.tm_sec:02d}"
+    if not date:
+        return clock
+    return f"{lt.tm_year:04d}-{lt.tm_mon:02d}-{lt.tm_mday:02d} {clock}"
+
+
+@functools.lru_cache(maxsize=256)
+def _url_label(url):
+    """Generate a short label for URL display (cached; labels never change per URL)"""
+    try:
+        # Extract event name from polymarket URLs
+        match = _POLY_SLUG_RE.search(url)
+        if match:
+            event_name = match.group(1).replace('-', ' ')
+            return event_name[:30] + "..." if len(event_name) > 30 else event_name
+        
+        # Fallback: use domain + path
+        parsed = urlparse(url)
+        domain = parsed.netloc.replace('www.', '')
+        path = parsed.path.split('/')[-1] if parsed.path else ''
+        return f"{domain}/{path}"[:40]
+    except:
+        return url[:40] + "..." if len(url) > 40 else url
+
+
+class _BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotating file handler that buffers writes and leaves flushing to the caller.
+    
+    The stock handler flushes after every record, and its rollover check seeks to
+    the end of the file (which flushes too). Here the file size is tracked in a
+    byte counter instead, so records collect in a 64 KB buffer and Logger flushes
+    it once a second (and on rollover/close).
+    
+    The first failed write or flush prints one warning and disables the handler,
+    so a full disk doesn't print a traceback for every record.
+    """
+    
+    _disabled = False
+    
+    def _open(self):
+        stream = open(self.baseFilename, self.mode, encoding=self.encoding, buffering=65536)
+        self._bytes_written = os.fstat(stream.fileno()).st_size
+        return stream
+    
+    def emit(self, record):
+        if self._disabled:
+            return
+        try:
+            msg = self.format(record) + self.terminator
+            size = len(msg.encode(self.encoding or 'utf-8'))
+            if self.stream is None:
+                self.stream = self._open()
+            # Roll over before a record would push the file past maxBytes (never on an empty file)
+            if self.maxBytes > 0 and self._bytes_written and self._bytes_written + size > self.maxBytes:
+                self.doRollover()
+            self.stream.write(msg)
+            self._bytes_written += size
+        except RecursionError:
+            raise
+        except Exception as e:
+            self._disable(e)
+    
+    def sync(self, fsync=False):
+        """Flush the buffer to the OS, optionally forcing it to disk"""
+        with self.lock:
+            if self.stream and not self._disabled:
+                try:
+                    self.stream.flush()
+                    if fsync:
+                        os.fsync(self.stream.fileno())
+                except Exception as e:
+                    self._disable(e)
+    
+    def _disable(self, error):
+        """Warn once and stop writing to the file"""
+        print(f"Warning: Could not write to log file: {error}")
+        self._disabled = True
+        # Drop the unwritable buffer; closing still releases the fd if the final flush fails
+        if self.stream:
+            try:
+                self.stream.close()
+            except Exception:
+                pass
+            self.stream = None
+
+
+class _DiscordLogHandler(logging.Handler):
+    """Forwards log records to the Discord log channel"""
+    
+    def __init__(self, discord_notifier):
+        super().__init__(logging.INFO)
+        self.discord_notifier = discord_notifier
+    
+    def emit(self, record):
+        try:
+            self.discord_notifier.send_log_message(self._format_for_discord(self.format(record)))
+        except Exception:
+            self.handleError(record)
+    
+    def _format_for_discord(self, message):
+        """Format message for Discord, escaping markdown characters.
+        
+        Long messages are left whole; DiscordNotifier splits them to fit its limit.
+        """
+        # Escape markdown characters that might interfere
+        return message.replace('`', '\\`').replace('*', '\\*').replace('_', '\\_')
 
 
 class Logger:
@@ -20,14 +188,28 @@ class Logger:
         # For Mac, ensure we're using the script's directory or home directory
         if not os.path.isabs(log_file):
             # Try script directory first
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            self.log_file = os.path.join(script_dir, log_file)
+            self.log_file = os.path.join(SCRIPT_DIR, log_file)
         else:
             self.log_file = log_file
         
         # Store Discord notifier for log channel
         self.discord_notifier = discord_notifier
         
+        # Console, file and Discord output go through the logging module. The console
+        # is written directly so it stays in order with the interactive prompts; file
+        # and Discord records are handed to a listener thread through a queue, so
+        # logging never waits on disk or webhook I/O. The file handler keeps its fd
+        # open and is flushed periodically instead of per line.
+        # The logger name is unique to this instance so a second Logger gets its own handlers
+        self._logger = logging.getLogger(f'arbitrage_monitor.{id(self):x}')
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        self._console_handler = logging.StreamHandler(sys.stdout)
+        self._logger.addHandler(self._console_handler)
+        self._file_handler = None
+        self._listener = None
+        self._closed = threading.Event()
+        
         # Create directory if it doesn't exist
         log_dir = os.path.dirname(self.log_file)
         if log_dir and not os.path.exists(log_dir):
@@ -39,15 +221,42 @@ class Logger:
         # Test write permissions on initialization
         self._test_write_permissions()
         
+        queued_handlers = []
+        if self._file_handler:
+            queued_handlers.append(self._file_handler)
+        if discord_notifier:
+            queued_handlers.append(_DiscordLogHandler(discord_notifier))
+        if queued_handlers:
+            log_queue = queue.SimpleQueue()
+            self._queue_handler = logging.handlers.QueueHandler(log_queue)
+            self._logger.addHandler(self._queue_handler)
+            self._listener = logging.handlers.QueueListener(log_queue, *queued_handlers, respect_handler_level=True)
+            self._listener.start()
+        
+        # Background flusher so buffered lines reach the file within about a second
+        if self._file_handler:
+            threading.Thread(target=self._flush_periodically, daemon=True).start()
+        
+    def _open_log_file(self, log_file, test_msg):
+        """Open the rotating log file handler and write a test line to it"""
+        handler = _BufferedRotatingFileHandler(log_file, maxBytes=5_000_000, backupCount=3, encoding='utf-8')
+        try:
+            handler.stream.write(test_msg)
+            handler._bytes_written += len(test_msg.encode('utf-8'))
+            # Flush the stream directly: sync() would swallow the error and disable the
+            # handler, and the caller needs it raised to try the next location
+            handler.stream.flush()
+        except Exception:
+            handler.close()
+            raise
+        handler.setLevel(logging.INFO)
+        self._file_handler = handler
+        
     def _test_write_permissions(self):
         """Test if we can write to the log file"""
         try:
             # Test write access
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                test_msg = f"# Log file test - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-                f.write(test_msg)
-                f.flush()
-                os.fsync(f.fileno())  # Force write to disk
+            self._open_log_file(self.log_file, f"# Log file test - {_ts()}\n")
             print(f"✅ Log file initialized successfully: {self.log_file}")
             print(f"✅ Log file absolute path: {os.path.abspath(self.log_file)}")
         except PermissionError:
@@ -68,11 +277,7 @@ class Logger:
         
         for fallback_log in fallback_locations:
             try:
-                with open(fallback_log, 'a', encoding='utf-8') as f:
-                    test_msg = f"# Fallback log file test - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-                    f.write(test_msg)
-                    f.flush()
-                    os.fsync(f.fileno())
+                self._open_log_file(fallback_log, f"# Fallback log file test - {_ts()}\n")
                 self.log_file = fallback_log
                 print(f"✅ Using fallback log file: {self.log_file}")
                 return
@@ -85,78 +290,239 @@ class Logger:
         
     def log_and_print(self, message):
         """Print to console, log to file, and send to Discord log channel"""
-        # Always print to console first
-        print(message)
-        sys.stdout.flush()
-        
-        # Try to write to log file
-        if self.log_file:
-            try:
-                with open(self.log_file, 'a', encoding='utf-8') as f:
-                    f.write(f"{message}\n")
-                    f.flush()
-                    os.fsync(f.fileno())  # Force write to disk on Mac
-            except Exception as e:
-                print(f"Warning: Could not write to log file: {e}")
-                self.log_file = None  # Disable logging if it keeps failing
-        
-        # Send to Discord log channel
-        if self.discord_notifier:
-            # Format message for Discord (escape markdown characters and limit length)
-            discord_message = self._format_for_discord(message)
-            self.discord_notifier.send_log_message(discord_message)
+        self._logger.info(message)
     
-    def _format_for_discord(self, message):
-        """Format message for Discord, handling long messages and special characters"""
-        # Escape markdown characters that might interfere
-        message = message.replace('`', '\\`').replace('*', '\\*').replace('_', '\\_')
-        
-        # Discord has a 2000 character limit per message
-        if len(message) > 1900:  # Leave some buffer
-            return message[:1900] + "... (truncated)"
-        
-        return message
+    def _flush_periodically(self):
+        """Flush buffered log lines once a second until the logger is closed"""
+        while not self._closed.wait(1.0):
+            self.flush()
+    
+    def flush(self):
+        """Push buffered log lines to the OS"""
+        if self._file_handler:
+            self._file_handler.sync()
+    
+    def close(self):
+        """Write out queued records, then flush and close the log file"""
+        self._closed.set()
+        if self._listener:
+            # Blocks until the listener has handled everything already queued
+            self._logger.removeHandler(self._queue_handler)
+            self._listener.stop()
+            # Shutdown is the one point worth forcing the log to disk
+            if self._file_handler:
+                self._file_handler.sync(fsync=True)
+            for handler in self._listener.handlers:
+                handler.close()
+            self._listener = None
+        self._logger.removeHandler(self._console_handler)
+        self._console_handler.close()
+        self._file_handler = None
 
 
 class DiscordNotifier:
-    def __init__(self, webhook_url, log_webhook_url=None, username="Arbitrage Monitor"):
+    def __init__(self, webhook_url, log_webhook_url=None, username="Arbitrage Monitor", stop_event=None):
         self.webhook_url = webhook_url
         self.log_webhook_url = log_webhook_url
         self.username = username
         
+        # Set on shutdown: rate-limit and coalescing waits return at once so the queue
+        # drains without sleeping (shared with the monitor when it owns this notifier)
+        self._stop = stop_event or threading.Event()
+        
+        # Reuse one keep-alive connection to Discord across all webhook posts. Transient
+        # connection errors and 5xx responses are retried with backoff. 429s are left to
+        # _post, which counts each attempt against the rate limit and waits on the stop
+        # event: urllib3 would otherwise retry any response carrying Retry-After itself,
+        # sleeping uninterruptibly. Read errors are not retried: Discord may already have
+        # posted the message, so a resend would duplicate it.
+        self.session = requests.Session()
+        retry = Retry(
+            total=3,
+            read=0,
+            respect_retry_after_header=False,
+            backoff_factor=0.5,
+            status_forcelist=[500, 502, 503, 504],
+            allowed_methods=['POST'],
+            raise_on_status=False
+        )
+        self.session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=retry))
+        
+        # Messages are posted by background threads so callers never wait on Discord.
+        # Each webhook has its own queue and thread, so alerts and log posts go out
+        # concurrently and a rate-limited log channel never holds back an alert.
+        # Each also keeps its recent post times, to stay under Discord's 30 posts/minute
+        # webhook limit.
+        self._queues = {}
+        self._sent_times = {}
+        self._worker_threads = []
+        for url in (webhook_url, log_webhook_url):
+            if url and url not in self._queues:
+                self._queues[url] = queue.Queue()
+                self._sent_times[url] = collections.deque(maxlen=30)
+                worker = threading.Thread(target=self._worker, args=(url, self._queues[url]), daemon=True)
+                worker.start()
+                self._worker_threads.append(worker)
+        
     def send_message(self, message, to_log_channel=False):
-        """Send a message to Discord via webhook"""
+        """Queue a message for delivery to Discord via webhook"""
+        webhook_to_use = self.log_webhook_url if to_log_channel and self.log_webhook_url else self.webhook_url
+        if webhook_to_use not in self._queues:
+            return False
+        self._queues[webhook_to_use].put((message, to_log_channel))
+        return True
+    
+    def close(self, timeout=5):
+        """Deliver any queued messages and stop the background threads"""
+        for webhook_queue in self._queues.values():
+            webhook_queue.put(None)
+        # The threads drain in parallel, so they share one overall timeout
+        deadline = time.monotonic() + timeout
+        for worker in self._worker_threads:
+            worker.join(max(deadline - time.monotonic(), 0))
+    
+    def _worker(self, webhook, webhook_queue):
+        """Post one webhook's queued messages, coalescing log lines that arrive close together into one post"""
+        pending = []
+        while True:
+            item = pending.pop() if pending else webhook_queue.get()
+            if item is None:
+                return
+            
+            message, coalesce = item
+            lines = [message]
+            size = len(message)
+            
+            # Collect up to 10 log lines over a 2 second window, staying within
+            # Discord's 2000 char limit
+            window_end = time.monotonic() + 2.0
+            while coalesce and len(lines) < 10:
+                remaining = 0 if self._stop.is_set() else window_end - time.monotonic()
+                try:
+                    if remaining > 0:
+                        next_item = webhook_queue.get(timeout=remaining)
+                    else:
+                        next_item = webhook_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if next_item is None or not next_item[1] or size + 1 + len(next_item[0]) > 2000:
+                    pending.append(next_item)
+                    break
+                lines.append(next_item[0])
+                size += 1 + len(next_item[0])
+            
+            # An unexpected error must not kill the thread, or this webhook's queue would never drain
+            try:
+                self._post(webhook, '\n'.join(lines))
+            except Exception as e:
+                print(f"Discord notification error: {e}")
+    
+    def _wait_for_rate_limit(self, webhook_url):
+        """Block until another post to this webhook fits in the 30-per-minute budget"""
+        sent = self._sent_times[webhook_url]
+        if len(sent) == sent.maxlen:
+            wait = sent[0] + 60 - time.monotonic()
+            if wait > 0:
+                self._stop.wait(wait)
+    
+    def _retry_after(self, response):
+        """Seconds a 429 response asks us to wait: the JSON body's retry_after, else the Retry-After header"""
         try:
-            webhook_to_use = self.log_webhook_url if to_log_channel and self.log_webhook_url else self.webhook_url
+            body = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            # Not Discord's JSON (e.g. a Cloudflare ban page)
+            body = None
+        if isinstance(body, dict) and body.get('retry_after') is not None:
+            return float(body['retry_after'])
+        return float(response.headers.get('Retry-After', 1))
+    
+    def _post(self, webhook_url, message):
+        """Send a message to Discord via webhook, honouring Discord's rate limits"""
+        data = {
+            'content': message,
+            'username': self.username
+        }
+        
+        for attempt in range(3):
+            self._wait_for_rate_limit(webhook_url)
+            try:
+                response = self.session.post(
+                    webhook_url,
+                    data=orjson.dumps(data),
+                    headers={'Content-Type': 'application/json'},
+                    timeout=10
+                )
+            except Exception as e:
+                print(f"Discord notification error: {e}")
+                return False
+            self._sent_times[webhook_url].append(time.monotonic())
+            
+            try:
+                if response.status_code == 429:
+                    # Rate limited anyway: wait as long as Discord asks, then retry
+                    self._stop.wait(self._retry_after(response))
+                    continue
+                
+                # Bucket exhausted: let it refill before the next post goes out
+                if response.headers.get('X-RateLimit-Remaining') == '0':
+                    self._stop.wait(float(response.headers.get('X-RateLimit-Reset-After', 0)))
+            except (ValueError, TypeError):
+                pass
             
-            data = {
-                'content': message,
-                'username': self.username
-            }
-            response = requests.post(webhook_to_use, json=data, timeout=10)
             if response.status_code == 204:
                 return True
             else:
                 print(f"Discord webhook failed: {response.status_code}")
                 return False
-        except Exception as e:
-            print(f"Discord notification error: {e}")
-            return False
+        
+        print("Discord webhook failed: still rate limited after retries")
+        return False
             
     def send_log_message(self, message):
         """Send a message specifically to the log channel"""
         if not self.log_webhook_url:
             return False
-        return self.send_message(message, to_log_channel=True)
+        # Whole-cycle log records can exceed Discord's limit: queue them in line-aligned
+        # pieces, which the worker then packs back into as few posts as fit
+        for chunk in self._split_message(message):
+            self.send_message(chunk, to_log_channel=True)
+        return True
+    
+    def _split_message(self, message, limit=1900):
+        """Split a message on line boundaries into pieces of at most limit characters"""
+        if len(message) <= limit:
+            return [message]
+        
+        chunks = []
+        current = []
+        size = 0
+        for line in message.split('\n'):
+            # A single overlong line is cut into limit-sized slices
+            while len(line) > limit:
+                if current:
+                    chunks.append('\n'.join(current))
+                    current, size = [], 0
+                chunks.append(line[:limit])
+                line = line[limit:]
+            if current and size + 1 + len(line) > limit:
+                chunks.append('\n'.join(current))
+                current, size = [], 0
+            size += len(line) + (1 if current else 0)
+            current.append(line)
+        if current:
+            chunks.append('\n'.join(current))
+        return chunks
     
     def send_arbitrage_alert(self, url_label, margin, prices, odds):
         """Send a formatted arbitrage opportunity alert"""
-        message = f"🎯 **ARBITRAGE OPPORTUNITY!**\n"
-        message += f"📊 Market: {url_label}\n"
-        message += f"💰 Margin: {margin:.2f}%\n"
-        message += f"🏷️ Prices: {prices}\n"
-        message += f"📈 Odds: {[round(odd, 2) for odd in odds]}\n"
-        message += f"⏰ Time: {datetime.now().strftime('%H:%M:%S')}"
+        message = (
+            f"🎯 **ARBITRAGE OPPORTUNITY!**\n"
+            f"📊 Market: {url_label}\n"
+            f"💰 Margin: {margin:.2f}%\n"
+            f"🏷️ Prices: {prices}\n"
+            f"📈 Odds: {[round(odd, 2) for odd in odds]}\n"
+            f"⏰ Time: {_ts(date=False)}"
+        )
         
         # Add @everyone mention for high margin opportunities (>5%)
         if margin > 5.0:
@@ -166,16 +532,17 @@ class DiscordNotifier:
     
     def send_summary(self, total_urls, opportunities):
         """Send a summary of all checked URLs"""
+        lines = [
+            f"📋 **SCAN SUMMARY** - {_ts(date=False)}",
+            f"🔍 Checked {total_urls} markets",
+        ]
         if opportunities:
-            message = f"📋 **SCAN SUMMARY** - {datetime.now().strftime('%H:%M:%S')}\n"
-            message += f"🔍 Checked {total_urls} markets\n"
-            message += f"🎯 Found {len(opportunities)} opportunities:\n"
-            for url_label, margin in opportunities:
-                message += f"  • {url_label}: {margin:.2f}%\n"
+            lines.append(f"🎯 Found {len(opportunities)} opportunities:")
+            lines.extend(f"  • {url_label}: {margin:.2f}%" for url_label, margin in opportunities)
+            lines.append("")
         else:
-            message = f"📋 **SCAN SUMMARY** - {datetime.now().strftime('%H:%M:%S')}\n"
-            message += f"🔍 Checked {total_urls} markets\n"
-            message += f"❌ No arbitrage opportunities found"
+            lines.append("❌ No arbitrage opportunities found")
+        message = '\n'.join(lines)
         
         return self.send_message(message)
 
@@ -185,16 +552,53 @@ class ArbitrageMonitor:
         self.urls = urls if isinstance(urls, list) else [urls]  # Support both single URL and list
         self.price_class = price_class
         self.outcome_class = outcome_class
+        
+        # Selectors are built once here rather than on every extraction: an exact
+        # class-token match, plus a substring match on the class attribute as fallback.
+        # Outcome (<p>) and price (<div>) selectors are grouped so one DOM walk finds both.
+        self._price_css = 'div.' + price_class.replace(' ', '.')
+        self._page_css = 'p.' + outcome_class.replace(' ', '.') + ', ' + self._price_css
+        self._page_fallback_css = (
+            'p' + ''.join(f'[class*="{cls}"]' for cls in outcome_class.split()) + ', ' +
+            'div' + ''.join(f'[class*="{cls}"]' for cls in price_class.split())
+        )
         self.check_interval_minutes = check_interval_minutes
         self.check_interval_seconds = check_interval_minutes * 60  # Convert to seconds
-        self.running = True
+        
+        # Set to stop monitoring; waking on it is immediate, and the Discord worker
+        # shares it so its rate-limit sleeps end at once on shutdown too
+        self._stop = threading.Event()
         
         # Initialize Discord notifier with both webhooks
-        self.discord = DiscordNotifier(webhook_url, log_webhook_url) if webhook_url else None
+        self.discord = DiscordNotifier(webhook_url, log_webhook_url, stop_event=self._stop) if webhook_url else None
         
-        # Initialize logger with Discord notifier for log channel
+        # Initialize logger with Discord notifier for log channel; one created here is
+        # closed by close(), a logger passed in is left to its owner
+        self._owns_logger = logger is None
         self.logger = logger or Logger("log.txt", self.discord)
         
+        # Shared HTTP session so fallback fetches reuse pooled keep-alive connections
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        })
+        pool_size = max(len(self.urls), 1)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size * 2)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Validators and parsed result of the last API/HTTP response per request URL,
+        # for conditional GETs: {url: (etag, last_modified, parsed_result)}
+        self._cache = {}
+        
+        # Gamma market ids behind each URL, resolved from its event slug on the first check
+        # and refreshed every _MARKET_REFRESH_CYCLES checks
+        self._market_ids = {}
+        self._api_cycles = 0
+        
+        # Lines held back by _batched_logs while a check cycle runs (None when not batching)
+        self._log_buf = None
+        
         # Store last arbitrage data for trading (now per URL)
         self.last_data = {}
         for url in self.urls:
@@ -205,10 +609,143 @@ class ArbitrageMonitor:
                 'margin': 0
             }
         
+        # Pool of headless Chrome instances reused across URLs and cycles, one per worker.
+        # Slots start empty (None) and a browser is only launched the first time the
+        # API path fails for a URL; a crashed browser is also reset to None.
+        self.pool_size = max(min(len(self.urls), 4), 1)
+        self._driver_pool = queue.Queue()
+        for _ in range(self.pool_size):
+            self._driver_pool.put(None)
+        
+        # Every live browser, including ones checked out by an in-flight fetch, so
+        # close() can quit them all rather than only those idle in the pool
+        self._drivers = set()
+        self._drivers_lock = threading.Lock()
+        # Set by close() under _drivers_lock; no browser is launched after that
+        self._closed = False
+        
+        # One worker per URL so every market's API/HTTP fetch runs at once and a cycle
+        # takes about as long as the slowest market; Chrome fallbacks beyond the driver
+        # pool size simply wait for a free browser
+        self._executor = ThreadPoolExecutor(max_workers=max(len(self.urls), 1), thread_name_prefix='check')
+        
+        # Wait for stdin with the OS readiness API (kqueue on macOS, epoll on Linux)
+        # so the idle wait between checks needs no polling
+        self._sel = selectors.DefaultSelector()
+        try:
+            self._sel.register(sys.stdin, selectors.EVENT_READ)
+        except (ValueError, OSError) as e:
+            self.print_and_log(f"Interactive commands disabled, cannot watch stdin: {e}")
+        
+        # Have the interpreter write a byte to a pipe whenever a signal arrives, and watch
+        # the pipe too, so a Ctrl+C wakes the selector at once whatever its timeout
+        self._wakeup_r = None
+        self._prev_wakeup_fd = -1
+        self._wakeup_installed = False
+        try:
+            self._wakeup_r, self._wakeup_w = os.pipe()
+            os.set_blocking(self._wakeup_r, False)
+            os.set_blocking(self._wakeup_w, False)
+            # Keep whatever wakeup fd was installed before, to put it back on close
+            self._prev_wakeup_fd = signal.set_wakeup_fd(self._wakeup_w)
+            self._wakeup_installed = True
+            self._sel.register(self._wakeup_r, selectors.EVENT_READ)
+        except (ValueError, OSError):
+            # set_wakeup_fd only works from the main thread
+            self._close_wakeup_fd()
+        
+    def _close_wakeup_fd(self):
+        """Detach and close the signal wakeup pipe, restoring the previous wakeup fd"""
+        if getattr(self, '_wakeup_r', None) is None:
+            return
+        if self._wakeup_installed:
+            try:
+                # Only put the old fd back if ours is still the one installed
+                current = signal.set_wakeup_fd(self._prev_wakeup_fd)
+                if current != self._wakeup_w:
+                    signal.set_wakeup_fd(current)
+            except ValueError:
+                # Not on the main thread: our write end may still be the wakeup fd, so
+                # leave the pipe open rather than let signals write to a reused fd number
+                return
+            self._wakeup_installed = False
+        try:
+            self._sel.unregister(self._wakeup_r)
+        except (KeyError, ValueError):
+            pass
+        os.close(self._wakeup_r)
+        os.close(self._wakeup_w)
+        self._wakeup_r = None
+        
+    def __del__(self):
+        self.close()
+        
+    def close(self):
+        """Shut down workers and pooled Chrome instances and flush pending Discord messages"""
+        # In-flight fetches see the stop event and return before any further browser
+        # launch or HTTP fallback, so their threads finish promptly
+        if getattr(self, '_stop', None):
+            self._stop.set()
+        
+        # Hand the logger's queued records to the file and Discord before the notifier drains
+        if getattr(self, '_owns_logger', False):
+            self._owns_logger = False
+            self.logger.close()
+        
+        if getattr(self, 'discord', None):
+            self.discord.close()
+        
+        if getattr(self, '_executor', None):
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        
+        if getattr(self, 'session', None):
+            self.session.close()
+        
+        self._close_wakeup_fd()
+        
+        drivers_lock = getattr(self, '_drivers_lock', None)
+        if drivers_lock is None:
+            return
+        with drivers_lock:
+            self._closed = True
+            drivers = list(self._drivers)
+        for driver in drivers:
+            self._quit_driver(driver)
+    
+    def _quit_driver(self, driver):
+        """Quit a Chrome instance, ignoring errors from an already dead browser"""
+        if driver is not None:
+            with self._drivers_lock:
+                self._drivers.discard(driver)
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        
     def print_and_log(self, message):
         """Helper method to print and log messages"""
+        # Inside _batched_logs the message is held back and written with the rest of the cycle
+        if self._log_buf is not None:
+            self._log_buf.append(message)
+            return
         self.logger.log_and_print(message)
     
+    @contextlib.contextmanager
+    def _batched_logs(self):
+        """Collect print_and_log messages and emit them as one record on exit.
+        
+        One record means one stdout write, one append to the log file buffer and
+        one queued Discord log message for the whole block, instead of one each
+        per line. Worker threads may log concurrently; list.append is atomic.
+        """
+        self._log_buf = []
+        try:
+            yield
+        finally:
+            lines, self._log_buf = self._log_buf, None
+            if lines:
+                self.logger.log_and_print('\n'.join(lines))
+    
     def send_discord_notification(self, message):
         """Send notification to Discord if webhook is configured"""
         if self.discord:
@@ -217,226 +754,254 @@ class ArbitrageMonitor:
     
     def get_url_label(self, url):
         """Generate a short label for URL display"""
+        return _url_label(url)
+        
+    def _create_driver(self):
+        """Start a headless Chrome instance (refused once the monitor is stopping)"""
+        if self._stop.is_set():
+            raise RuntimeError("monitor is shutting down")
+        
+        chrome_options = Options()
+        chrome_options.add_argument('--headless')
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-gpu')
+        chrome_options.add_argument('--disable-extensions')
+        
+        # Mac-specific Chrome options
+        chrome_options.add_argument('--disable-logging')
+        chrome_options.add_argument('--log-level=3')
+        
+        driver = webdriver.Chrome(options=chrome_options)
+        with self._drivers_lock:
+            if not self._closed:
+                self._drivers.add(driver)
+                return driver
+        # close() ran while Chrome was starting and won't see this browser
         try:
-            # Extract a meaningful part of the URL
-            if 'polymarket.com' in url:
-                # Extract event name from polymarket URLs
-                parts = url.split('/')
-                if 'event' in parts:
-                    event_index = parts.index('event')
-                    if event_index + 1 < len(parts):
-                        event_name = parts[event_index + 1].replace('-', ' ')
-                        return event_name[:30] + "..." if len(event_name) > 30 else event_name
-            
-            # Fallback: use domain + path
-            from urllib.parse import urlparse
-            parsed = urlparse(url)
-            domain = parsed.netloc.replace('www.', '')
-            path = parsed.path.split('/')[-1] if parsed.path else ''
-            return f"{domain}/{path}"[:40]
-        except:
-            return url[:40] + "..." if len(url) > 40 else url
-        
-    def extract_outcome_names(self, url):
-        """Extract outcome names from p tags with the specified class"""
+            driver.quit()
+        except Exception:
+            pass
+        raise RuntimeError("monitor is shutting down")
+
+    def _fetch_page(self, url):
+        """Load a URL in a pooled browser and return the rendered HTML"""
+        driver = self._driver_pool.get()
+        if self._stop.is_set():
+            # Hand the slot back untouched; close() quits any browser in it
+            self._driver_pool.put(driver)
+            raise RuntimeError("monitor is shutting down")
         try:
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--disable-extensions')
+            if driver is None:
+                driver = self._create_driver()
             
-            # Mac-specific Chrome options
-            chrome_options.add_argument('--disable-logging')
-            chrome_options.add_argument('--log-level=3')
+            driver.get(url)
             
-            driver = webdriver.Chrome(options=chrome_options)
+            # Wait for the price rows to render instead of sleeping a fixed time
+            try:
+                WebDriverWait(driver, 5).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, self._price_css))
+                )
+            except TimeoutException:
+                pass  # Parse whatever rendered; the class fallback may still match
             
+            return driver.page_source
+        except Exception:
+            # Drop a broken browser so the next fetch starts a fresh one
+            self._quit_driver(driver)
+            driver = None
+            raise
+        finally:
+            self._driver_pool.put(driver)
+
+    def _get_event_slug(self, url):
+        """Return the event slug of a polymarket.com/event/<slug> URL, or None"""
+        match = _POLY_SLUG_RE.search(url)
+        return match.group(1) if match else None
+
+    def _resolve_market_ids(self, url):
+        """Look up the open market ids of a URL's event; cycles in between reuse them"""
+        slug = self._get_event_slug(url)
+        if not slug:
+            self._market_ids[url] = []
+            return
+        
+        response = self.session.get(f"{GAMMA_API_URL}/events", params={'slug': slug}, timeout=10)
+        if response.status_code == 404:
+            self._market_ids[url] = []
+            return
+        response.raise_for_status()
+        
+        events = orjson.loads(response.content)
+        markets = events[0].get('markets', []) if events else []
+        self._market_ids[url] = [str(market['id']) for market in markets if not market.get('closed')]
+
+    def _fetch_markets_api(self):
+        """Fetch the markets of every URL from the Gamma API in one request.
+        
+        Returns {url: (outcome_names, yes_prices)} for the URLs the API could
+        price; the rest are left for the page scrape.
+        """
+        # Resolve slugs that haven't been looked up yet (all of them on the first cycle),
+        # and every URL again each _MARKET_REFRESH_CYCLES cycles to pick up new markets.
+        # A failed refresh keeps the ids from the last successful lookup.
+        refresh = self._api_cycles % _MARKET_REFRESH_CYCLES == 0
+        self._api_cycles += 1
+        unresolved = [url for url in self.urls if refresh or url not in self._market_ids]
+        for url, error in zip(unresolved, self._executor.map(self._try_resolve_market_ids, unresolved)):
+            if error:
+                self.print_and_log(f"API lookup failed for {self.get_url_label(url)}: {error}")
+        
+        ids = [market_id for url in self.urls for market_id in self._market_ids.get(url, [])]
+        if not ids:
+            return {}
+        
+        query = '&'.join(f"id={market_id}" for market_id in ids)
+        markets_by_id = self._conditional_get(
+            f"{GAMMA_API_URL}/markets?limit={len(ids)}&{query}",
+            lambda content: {str(market['id']): market for market in orjson.loads(content)}
+        ) or {}
+        
+        results = {}
+        for url in self.urls:
+            markets = [markets_by_id[market_id] for market_id in self._market_ids.get(url, []) if market_id in markets_by_id]
+            # A malformed market only sends its own URL to the page scrape
             try:
-                driver.get(url)
-                time.sleep(3)
-                
-                outcome_names = []
-                class_selector = self.outcome_class.replace(' ', '.')
-                elements = driver.find_elements(By.CSS_SELECTOR, f"p.{class_selector}")
-                
-                for element in elements:
-                    try:
-                        content = element.text.strip()
-                        if content:
-                            outcome_names.append(content)
-                    except:
-                        continue
-                
-                # Alternative method if CSS selector doesn't work
-                if not outcome_names:
-                    all_p_tags = driver.find_elements(By.TAG_NAME, "p")
-                    for element in all_p_tags:
-                        try:
-                            element_class = element.get_attribute("class") or ""
-                            if all(cls in element_class for cls in self.outcome_class.split()):
-                                content = element.text.strip()
-                                if content:
-                                    outcome_names.append(content)
-                        except:
-                            continue
-                
-                return outcome_names
-                    
-            finally:
-                driver.quit()
-                
-        except Exception as e:
-            self.print_and_log(f"Selenium extraction failed for {self.get_url_label(url)}: {e}")
-            return self.extract_outcome_names_beautifulsoup(url)
+                market_data = self._parse_markets([market for market in markets if not market.get('closed')])
+            except Exception as e:
+                self.print_and_log(f"API data unusable for {self.get_url_label(url)}: {e}")
+                continue
+            if market_data is not None:
+                results[url] = market_data
+        return results
 
-    def extract_outcome_names_beautifulsoup(self, url):
-        """Fallback method using BeautifulSoup for outcome names"""
+    def _try_resolve_market_ids(self, url):
+        """Resolve a URL's market ids, returning the error instead of raising it"""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            outcome_names = []
-            
-            target_p_tags = soup.find_all('p', class_=self.outcome_class)
-            
-            for p_tag in target_p_tags:
-                content = p_tag.get_text(strip=True)
-                if content:
-                    outcome_names.append(content)
-            
-            return outcome_names
-            
+            self._resolve_market_ids(url)
         except Exception as e:
-            self.print_and_log(f"BeautifulSoup extraction failed for {self.get_url_label(url)}: {e}")
-            return []
+            return e
+        return None
 
-    def extract_yes_prices(self, url):
-        """Extract yes prices from divs and return as float list"""
-        try:
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--disable-extensions')
-            
-            # Mac-specific Chrome options
-            chrome_options.add_argument('--disable-logging')
-            chrome_options.add_argument('--log-level=3')
-            
-            driver = webdriver.Chrome(options=chrome_options)
-            
-            try:
-                driver.get(url)
-                time.sleep(3)
-                
-                yes_prices = []
-                class_selector = self.price_class.replace(' ', '.')
-                elements = driver.find_elements(By.CSS_SELECTOR, f"div.{class_selector}")
-                
-                for element in elements:
-                    try:
-                        content = element.text.strip()
-                        
-                        if 'yes' in content.lower():
-                            yes_price_matches = re.findall(r'yes[^¢]*?(\d+(?:\.\d+)?)¢', content.lower())
-                            
-                            for match in yes_price_matches:
-                                yes_prices.append(float(match))
-                            
-                            if not yes_price_matches:
-                                decimal_matches = re.findall(r'yes[^\d]*?(\d+(?:\.\d+)?)', content.lower())
-                                for match in decimal_matches:
-                                    try:
-                                        price = float(match)
-                                        if 0 < price <= 100:
-                                            yes_prices.append(price)
-                                    except:
-                                        continue
-                                        
-                    except:
-                        continue
-                
-                # Alternative method if CSS selector doesn't work
-                if not yes_prices:
-                    all_divs = driver.find_elements(By.TAG_NAME, "div")
-                    for element in all_divs:
-                        try:
-                            element_class = element.get_attribute("class") or ""
-                            if all(cls in element_class for cls in self.price_class.split()):
-                                content = element.text.strip()
-                                
-                                if 'yes' in content.lower():
-                                    yes_price_matches = re.findall(r'yes[^¢]*?(\d+(?:\.\d+)?)¢', content.lower())
-                                    
-                                    for match in yes_price_matches:
-                                        yes_prices.append(float(match))
-                                    
-                                    if not yes_price_matches:
-                                        decimal_matches = re.findall(r'yes[^\d]*?(\d+(?:\.\d+)?)', content.lower())
-                                        for match in decimal_matches:
-                                            try:
-                                                price = float(match)
-                                                if 0 < price <= 100:
-                                                    yes_prices.append(price)
-                                            except:
-                                                continue
-                        except:
-                            continue
-                
-                return yes_prices
-                    
-            finally:
-                driver.quit()
-                
-        except Exception as e:
-            self.print_and_log(f"Selenium price extraction failed for {self.get_url_label(url)}: {e}")
-            return self.extract_yes_prices_beautifulsoup(url)
+    def _parse_markets(self, markets):
+        """Turn an event's open Gamma markets into (outcome_names, yes_prices) in cents, or None"""
+        if not markets:
+            return None
+        
+        outcome_names = []
+        yes_prices = []
+        
+        # outcomePrices are display (mid/last) prices, below what buying a leg costs. The
+        # order book's bestAsk is what the page's "Buy Yes" button charges, so it is used
+        # whenever the API reports one; bestAsk/bestBid quote the market's first outcome.
+        if len(markets) == 1:
+            # Binary market: every outcome (e.g. Yes/No) is its own leg
+            market = markets[0]
+            outcome_names = orjson.loads(market['outcomes'])
+            prices = [float(price) for price in orjson.loads(market['outcomePrices'])]
+            best_ask = float(market.get('bestAsk') or 0)
+            best_bid = float(market.get('bestBid') or 0)
+            if best_ask > 0:
+                prices[0] = best_ask
+            # Buying the other side of a two-outcome book costs one minus the best bid
+            if len(prices) == 2 and best_bid > 0:
+                prices[1] = 1 - best_bid
+            yes_prices = [round(price * 100, 2) for price in prices]
+        else:
+            # Categorical event: one Yes/No market per outcome, bet on each Yes
+            for market in markets:
+                outcomes = orjson.loads(market['outcomes'])
+                prices = orjson.loads(market['outcomePrices'])
+                yes_index = outcomes.index('Yes') if 'Yes' in outcomes else 0
+                yes_price = float(prices[yes_index])
+                best_ask = float(market.get('bestAsk') or 0)
+                if yes_index == 0 and best_ask > 0:
+                    yes_price = best_ask
+                outcome_names.append(market.get('groupItemTitle') or market.get('question', ''))
+                yes_prices.append(round(yes_price * 100, 2))
+        
+        # A zero price means the API has no live quote; let the page scrape handle it
+        if not yes_prices or any(price <= 0 for price in yes_prices):
+            return None
+        
+        return outcome_names, yes_prices
+
+    def _conditional_get(self, url, parse):
+        """GET a URL and return parse(body), revalidating against the last response.
+        
+        The ETag/Last-Modified of each response are kept with its parsed result, so
+        when the server answers 304 Not Modified the previous result is reused and
+        neither the body nor the parse is repeated. Returns None on 404.
+        """
+        headers = {}
+        cached = self._cache.get(url)
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        
+        response = self.session.get(url, headers=headers, timeout=10)
+        if response.status_code == 304 and cached:
+            return cached[2]
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        
+        result = parse(response.content)
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            self._cache[url] = (etag, last_modified, result)
+        else:
+            self._cache.pop(url, None)
+        return result
+
+    def _fetch_page_http(self, url):
+        """Fallback fetch using a plain HTTP request (no JavaScript rendering).
+        
+        Returns (outcome_names, yes_prices) parsed from the raw HTML, or None.
+        """
+        if self._stop.is_set():
+            return None
+        # The parser gets the raw bytes: it decodes natively, skipping requests'
+        # charset sniffing and the extra str copy that response.text makes
+        return self._conditional_get(url, lambda html: self._extract_all(url, html))
+
+    def _collect(self, nodes):
+        """Split matched nodes into outcome names (<p>) and yes prices (<div>), in page order"""
+        outcome_names = []
+        yes_prices = []
+        
+        for node in nodes:
+            if node.tag == 'p':
+                content = node.text(strip=True)
+                if content:
+                    outcome_names.append(content)
+            else:
+                yes_prices.extend(_parse_yes_prices(node.text(strip=True)))
+        
+        return outcome_names, yes_prices
 
-    def extract_yes_prices_beautifulsoup(self, url):
-        """Fallback method using BeautifulSoup"""
+    def _extract_all(self, url, html):
+        """Parse the page once and return (outcome_names, yes_prices) from the same tree"""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
+            tree = LexborHTMLParser(html)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            yes_prices = []
+            # One selector group walks the DOM once for both outcome and price nodes
+            outcome_names, yes_prices = self._collect(tree.css(self._page_css))
             
-            target_divs = soup.find_all('div', class_=self.price_class)
-            
-            for div in target_divs:
-                content = div.get_text(strip=True)
-                
-                if 'yes' in content.lower():
-                    yes_price_matches = re.findall(r'yes[^¢]*?(\d+(?:\.\d+)?)¢', content.lower())
-                    
-                    for match in yes_price_matches:
-                        yes_prices.append(float(match))
-                    
-                    if not yes_price_matches:
-                        decimal_matches = re.findall(r'yes[^\d]*?(\d+(?:\.\d+)?)', content.lower())
-                        for match in decimal_matches:
-                            try:
-                                price = float(match)
-                                if 0 < price <= 100:
-                                    yes_prices.append(price)
-                            except:
-                                continue
-            
-            return yes_prices
+            # Alternative method if the exact class selectors don't match
+            if not outcome_names or not yes_prices:
+                fallback_names, fallback_prices = self._collect(tree.css(self._page_fallback_css))
+                outcome_names = outcome_names or fallback_names
+                yes_prices = yes_prices or fallback_prices
             
+            return outcome_names, yes_prices
         except Exception as e:
-            self.print_and_log(f"BeautifulSoup price extraction failed for {self.get_url_label(url)}: {e}")
-            return []
+            self.print_and_log(f"Extraction failed for {self.get_url_label(url)}: {e}")
+            return [], []
 
     def calculate_arbitrage_margin(self, yes_prices):
         """Calculate arbitrage margin from yes prices"""
@@ -444,24 +1009,36 @@ class ArbitrageMonitor:
             return None, None
             
         odds = [100/price for price in yes_prices]
-        arbitrage_constant = sum(1/odd for odd in odds)
-        margin = (100/arbitrage_constant)-100
+        # 1/odd == price/100, so the arbitrage constant is sum(prices)/100 and the
+        # margin (100/arbitrage_constant)-100 reduces to a single sum over the prices
+        margin = 10000.0/sum(yes_prices) - 100.0
         
         return margin, odds
 
-    def check_for_input_mac(self):
-        """Mac-optimized input checking"""
-        try:
-            # Use select with a very short timeout
-            ready, _, _ = select.select([sys.stdin], [], [], 0.1)
-            if ready:
-                user_input = sys.stdin.readline().strip().lower()
-                return user_input
-        except Exception as e:
-            pass
-        return None
+    def wait_for_input(self, timeout):
+        """Block until a line arrives on stdin or the timeout expires; return the command or None.
+        
+        Also returns None as soon as a signal arrives, so the caller can check _stop.
+        """
+        events = self._sel.select(timeout=timeout)
+        if not events:
+            return None
+        if any(key.fileobj == self._wakeup_r for key, _ in events):
+            # Drain the signal bytes; the handler has already run by now
+            try:
+                while os.read(self._wakeup_r, 512):
+                    pass
+            except BlockingIOError:
+                pass
+            return None
+        line = sys.stdin.readline()
+        if not line:
+            # EOF (e.g. stdin redirected from a file): stop watching it, select() then just sleeps
+            self._sel.unregister(sys.stdin)
+            return None
+        return line.strip().lower()
 
-    def display_trading_table(self, url, yes_prices, odds, outcome_names, stake, arbitrage_constant):
+    def display_trading_table(self, url, yes_prices, odds, outcome_names, stake):
         """Display the trading distribution table and send to Discord"""
         url_label = self.get_url_label(url)
         
@@ -469,62 +1046,91 @@ class ArbitrageMonitor:
         self.print_and_log(f"\n🎯 Trading table for: {url_label}")
         self.print_and_log("Distribution of the stake among the odds should be as follows:")
         
-        # Build Discord message
-        discord_message = f"🎯 **TRADING TABLE**\n"
-        discord_message += f"📊 Market: {url_label}\n"
-        discord_message += f"💰 Total Stake: {stake}\n\n"
+        # Build Discord message as a list of lines, joined once at the end
+        discord_lines = [
+            "🎯 **TRADING TABLE**",
+            f"📊 Market: {url_label}",
+            f"💰 Total Stake: {stake}",
+            "",
+        ]
+        
+        # Staking each outcome in proportion to its price pays out the same amount
+        # whichever outcome wins: stake_i = stake*price_i/total, payout = stake*100/total
+        total_price = sum(yes_prices)
+        payout_amount = stake * 100.0 / total_price
         
         if outcome_names and len(outcome_names) >= len(yes_prices):
             self.print_and_log("\n{:<15} | {:<12} | {:<8} | {:<10} | {:<10}".format("Outcome Name", "Yes Price", "Odd", "Stake", "Payout"))
             self.print_and_log("-" * 70)
             
-            discord_message += "```\n"
-            discord_message += f"{'Outcome':<12} | {'Price':<8} | {'Stake':<8} | {'Payout':<8}\n"
-            discord_message += "-" * 45 + "\n"
+            discord_lines += [
+                "```",
+                f"{'Outcome':<12} | {'Price':<8} | {'Stake':<8} | {'Payout':<8}",
+                "-" * 45,
+            ]
             
             for i in range(len(yes_prices)):
-                stake_amount = stake * ((1/odds[i]) / arbitrage_constant)
-                payout_amount = odds[i] * stake_amount
+                stake_amount = stake * yes_prices[i] / total_price
                 outcome_name = outcome_names[i] if i < len(outcome_names) else f"Option {i+1}"
                 
                 self.print_and_log("{:<15} | {:<12} | {:<8.2f} | {:<10.2f} | {:<10.2f}".format(
                     outcome_name, yes_prices[i], odds[i], stake_amount, payout_amount))
                 
                 short_name = outcome_name[:10] + "..." if len(outcome_name) > 10 else outcome_name
-                discord_message += f"{short_name:<12} | {yes_prices[i]:<8} | {stake_amount:<8.2f} | {payout_amount:<8.2f}\n"
+                discord_lines.append(f"{short_name:<12} | {yes_prices[i]:<8} | {stake_amount:<8.2f} | {payout_amount:<8.2f}")
         else:
             self.print_and_log("\n{:<12} | {:<8} | {:<10} | {:<10}".format("Yes Price", "Odd", "Stake", "Payout"))
             self.print_and_log("-" * 50)
             
-            discord_message += "```\n"
-            discord_message += f"{'Price':<8} | {'Stake':<8} | {'Payout':<8}\n"
-            discord_message += "-" * 30 + "\n"
+            discord_lines += [
+                "```",
+                f"{'Price':<8} | {'Stake':<8} | {'Payout':<8}",
+                "-" * 30,
+            ]
             
             for i in range(len(yes_prices)):
-                stake_amount = stake * ((1/odds[i]) / arbitrage_constant)
-                payout_amount = odds[i] * stake_amount
+                stake_amount = stake * yes_prices[i] / total_price
                 
                 self.print_and_log("{:<12} | {:<8.2f} | {:<10.2f} | {:<10.2f}".format(
                     yes_prices[i], odds[i], stake_amount, payout_amount))
                 
-                discord_message += f"{yes_prices[i]:<8} | {stake_amount:<8.2f} | {payout_amount:<8.2f}\n"
+                discord_lines.append(f"{yes_prices[i]:<8} | {stake_amount:<8.2f} | {payout_amount:<8.2f}")
 
-        total_profit = stake * ((1/arbitrage_constant)-1)
+        total_profit = payout_amount - stake
         self.print_and_log(f"\nTotal profit would be: {total_profit:.2f}")
         
-        discord_message += "```\n"
-        discord_message += f"💵 **Total Profit: {total_profit:.2f}**"
+        discord_lines += ["```", f"💵 **Total Profit: {total_profit:.2f}**"]
         
         # Send to Discord
-        self.send_discord_notification(discord_message)
+        self.send_discord_notification('\n'.join(discord_lines))
 
-    def check_arbitrage_single_url(self, url):
-        """Check for arbitrage opportunities for a single URL"""
+    def check_arbitrage_single_url(self, url, market_data=None):
+        """Check for arbitrage opportunities for a single URL.
+        
+        market_data is the (outcome_names, yes_prices) already read from the API
+        for this URL; without it the page is scraped instead.
+        """
         url_label = self.get_url_label(url)
         
-        # Extract data
-        outcome_names = self.extract_outcome_names(url)
-        yes_prices = self.extract_yes_prices(url)
+        if market_data is not None:
+            outcome_names, yes_prices = market_data
+        else:
+            # Fetch the page once, preferring the rendered DOM over the raw HTTP response,
+            # and extract outcome names and prices from the same snapshot
+            page_data = None
+            try:
+                page_data = self._extract_all(url, self._fetch_page(url))
+            except Exception as e:
+                # Shutting down: skip the fallback and its 10 s timeout
+                if self._stop.is_set():
+                    return
+                self.print_and_log(f"Selenium page load failed for {url_label}: {e}")
+                try:
+                    page_data = self._fetch_page_http(url)
+                except Exception as e:
+                    self.print_and_log(f"HTTP fetch failed for {url_label}: {e}")
+            
+            outcome_names, yes_prices = page_data or ([], [])
         
         if not yes_prices:
             self.print_and_log(f"❌ [{url_label}] No prices found.")
@@ -537,21 +1143,25 @@ class ArbitrageMonitor:
             self.print_and_log(f"❌ [{url_label}] Could not calculate arbitrage margin.")
             return
         
-        # Display results
-        self.print_and_log(f"🌐 Checked for: [{url_label}]")
-        self.print_and_log(f"📊 Found {len(yes_prices)} outcomes")
-        self.print_and_log(f"🏷️  Prices: {yes_prices}")
-        self.print_and_log(f"📈 Odds: {[round(odd, 2) for odd in odds]}")
-        self.print_and_log(f"💰 Arbitrage margin: {margin:.2f}%")
-        
+        # Display results as a single log record so concurrent checks don't interleave
+        lines = [
+            f"\n🌐 Checked for: [{url_label}]",
+            f"📊 Found {len(yes_prices)} outcomes",
+            f"🏷️  Prices: {yes_prices}",
+            f"📈 Odds: {[round(odd, 2) for odd in odds]}",
+            f"💰 Arbitrage margin: {margin:.2f}%",
+        ]
         
         if margin > 0:
-            self.print_and_log(f"🎯 Arbitrage opportunity exists!")
-            # Send Discord alert for profitable opportunities
-            if self.discord:
-                self.discord.send_arbitrage_alert(url_label, margin, yes_prices, odds)
+            lines.append(f"🎯 Arbitrage opportunity exists!")
         else:
-            self.print_and_log(f"❌ No arbitrage opportunity (negative margin).")
+            lines.append(f"❌ No arbitrage opportunity (negative margin).")
+        
+        self.print_and_log('\n'.join(lines))
+        
+        # Send Discord alert for profitable opportunities
+        if margin > 0 and self.discord:
+            self.discord.send_arbitrage_alert(url_label, margin, yes_prices, odds)
         
         # Store data for potential trading
         self.last_data[url] = {
@@ -563,11 +1173,18 @@ class ArbitrageMonitor:
 
     def check_arbitrage(self):
         """Check for arbitrage opportunities across all URLs"""
-        self.print_and_log(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Checking {len(self.urls)} URLs for arbitrage opportunities...")
+        self.print_and_log(f"\n[{_ts()}] Checking {len(self.urls)} URLs for arbitrage opportunities...")
         
-        for i, url in enumerate(self.urls, 1):
-            self.print_and_log(f"\n--- URL {i}/{len(self.urls)} ---")
-            self.check_arbitrage_single_url(url)
+        # Polymarket serves the market data as JSON: one API request prices every URL,
+        # and only URLs it could not price fall back to scraping their page
+        api_data = {}
+        try:
+            api_data = self._fetch_markets_api()
+        except Exception as e:
+            self.print_and_log(f"API fetch failed: {e}")
+        
+        # Check all URLs concurrently on the persistent worker pool
+        list(self._executor.map(self.check_arbitrage_single_url, self.urls, [api_data.get(url) for url in self.urls]))
         
         # Summary of arbitrage opportunities
         opportunities = []
@@ -600,18 +1217,17 @@ class ArbitrageMonitor:
         self.print_and_log(f"\n📊 Available trades (showing all {len(all_trades)} markets):")
         
         # Build Discord message for all trades
-        discord_message = f"📊 **ALL AVAILABLE TRADES**\n"
-        discord_message += f"🔍 Total markets: {len(all_trades)}\n\n"
+        discord_parts = [f"📊 **ALL AVAILABLE TRADES**\n🔍 Total markets: {len(all_trades)}\n\n"]
         
         for i, url, data in all_trades:
             status = "🎯 PROFITABLE" if data['margin'] > 0 else "❌ Not profitable"
             url_label = self.get_url_label(url)
             
             self.print_and_log(f"   {i}. {url_label} - {data['margin']:.2f}% margin ({status})")
-            discord_message += f"{i}. {url_label}\n   Margin: {data['margin']:.2f}% {('🎯' if data['margin'] > 0 else '❌')}\n\n"
+            discord_parts.append(f"{i}. {url_label}\n   Margin: {data['margin']:.2f}% {('🎯' if data['margin'] > 0 else '❌')}\n\n")
         
         # Send to Discord
-        self.send_discord_notification(discord_message)
+        self.send_discord_notification(''.join(discord_parts))
         
         return all_trades
 
@@ -644,14 +1260,12 @@ class ArbitrageMonitor:
                 
                 stake = float(input("Enter your stake: "))
                 if stake > 0:
-                    arbitrage_constant = sum(1/odd for odd in selected_data['odds'])
                     self.display_trading_table(
                         selected_url,
                         selected_data['yes_prices'], 
                         selected_data['odds'], 
                         selected_data['outcome_names'], 
-                        stake, 
-                        arbitrage_constant
+                        stake
                     )
                 else:
                     self.print_and_log("Invalid stake amount.")
@@ -676,10 +1290,12 @@ class ArbitrageMonitor:
             self.print_and_log(f"📢 Discord notifications: Enabled")
             self.print_and_log(f"📢 Discord log channel: {'Enabled' if self.discord.log_webhook_url else 'Disabled'}")
             # Send startup notification
-            startup_msg = f"🚀 **ARBITRAGE MONITOR STARTED**\n"
-            startup_msg += f"⏰ Check interval: {self.check_interval_minutes} minutes\n"
-            startup_msg += f"🌐 Monitoring {len(self.urls)} markets\n"
-            startup_msg += f"🖥️ Platform: macOS"
+            startup_msg = (
+                f"🚀 **ARBITRAGE MONITOR STARTED**\n"
+                f"⏰ Check interval: {self.check_interval_minutes} minutes\n"
+                f"🌐 Monitoring {len(self.urls)} markets\n"
+                f"🖥️ Platform: macOS"
+            )
             self.discord.send_message(startup_msg)
         else:
             self.print_and_log(f"📢 Discord notifications: Disabled")
@@ -688,62 +1304,79 @@ class ArbitrageMonitor:
         self.print_and_log(f"💡 Type 'trade' + Enter anytime to see all trades\n")
         
         try:
-            while self.running:
-                # Check arbitrage first
-                self.check_arbitrage()
-                
-                # Now wait for the specified interval
-                self.print_and_log(f"⏳ Waiting {self.check_interval_minutes} minutes until next check.")
-                self.print_and_log(f"📝 Type 'trade' + Enter to see all available trades.")
+            while not self._stop.is_set():
+                # Schedule the next check from the start of this one, on the monotonic
+                # clock, so scan time and trade prompts don't stretch the interval
+                deadline = time.monotonic() + self.check_interval_seconds
                 
-                # Break the sleep into small chunks to check for input
-                sleep_chunk = 0.5  # Check every 0.5 seconds on Mac
-                elapsed_wait = 0
+                # Check arbitrage first; the cycle's output is written out in one go
+                with self._batched_logs():
+                    self.check_arbitrage()
+                    
+                    # Now wait out the rest of the interval, but never less than the minimum idle gap
+                    deadline = max(deadline, time.monotonic() + _MIN_IDLE_SECONDS)
+                    remaining_minutes = max(deadline - time.monotonic(), 0) / 60
+                    self.print_and_log(f"⏳ Waiting {remaining_minutes:.1f} minutes until next check.")
+                    self.print_and_log(f"📝 Type 'trade' + Enter to see all available trades.")
                 
-                while elapsed_wait < self.check_interval_seconds and self.running:
-                    time.sleep(sleep_chunk)
-                    elapsed_wait += sleep_chunk
+                # Sleep in the kernel until input arrives or the deadline passes
+                while not self._stop.is_set():
+                    remaining = deadline - time.monotonic()
                     
-                    # Check for user input
-                    user_input = self.check_for_input_mac()
+                    # Check for user input; stdin is polled at least once per cycle even
+                    # if the deadline has already passed
+                    user_input = self.wait_for_input(max(remaining, 0))
                     if user_input:
-                        if user_input in ['trade', 'yes', 'y']:
+                        if user_input in _TRADE_CMDS:
                             self.handle_trade_command()
-                        elif user_input in ['quit', 'exit', 'stop']:
+                        elif user_input in _QUIT_CMDS:
                             self.print_and_log("Stopping monitor...")
                             if self.discord:
                                 self.discord.send_message("🛑 **ARBITRAGE MONITOR STOPPED**")
-                            self.running = False
+                            self._stop.set()
                             break
                         else:
                             self.print_and_log("Type 'trade' to see all trades or 'quit' to stop.")
                     
+                    if deadline - time.monotonic() <= 0:
+                        break
+                    
+        except SystemExit:
+            # Raised by the SIGINT handler, which only sets the stop events; the line is
+            # logged here so it goes through the logging pipeline after the cycle's output
+            self.print_and_log("\n\n🛑 Received interrupt signal. Stopping monitor...")
+            raise
         except KeyboardInterrupt:
             self.print_and_log("\n\n🛑 Monitoring stopped by user.")
             if self.discord:
                 self.discord.send_message("🛑 **ARBITRAGE MONITOR STOPPED** (Manual interruption)")
-            self.running = False
+            self._stop.set()
         except Exception as e:
             self.print_and_log(f"\n❌ Error occurred: {e}")
             self.print_and_log("Monitoring stopped.")
             if self.discord:
                 self.discord.send_message(f"❌ **ARBITRAGE MONITOR ERROR**\nError: {str(e)}")
+        finally:
+            # Also runs on sys.exit() from the SIGINT handler
+            self.close()
+
+
+# Logger and monitor of the running script, so the signal handler can wake every
+# thread waiting on their stop events
+active_logger = None
+active_monitor = None
 
 
 def signal_handler(signum, frame):
-    """Handle Ctrl+C gracefully"""
-    print("\n\n🛑 Received interrupt signal. Stopping monitor...")
-    try:
-        # Try to find the log file
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        log_file = os.path.join(script_dir, "log.txt")
-        
-        with open(log_file, 'a', encoding='utf-8') as f:
-            f.write(f"\n\n🛑 Received interrupt signal. Stopping monitor...\n")
-            f.flush()
-            os.fsync(f.fileno())
-    except Exception as e:
-        print(f"Could not write to log file on exit: {e}")
+    """Handle Ctrl+C gracefully.
+    
+    Only wakes the waiting threads and exits; run() logs the interrupt and the
+    logger is flushed and synced to disk as the exit unwinds.
+    """
+    if active_monitor:
+        active_monitor._stop.set()
+    if active_logger and active_logger.discord_notifier:
+        active_logger.discord_notifier._stop.set()
     sys.exit(0)
 
 
@@ -754,7 +1387,7 @@ if __name__ == "__main__":
     
     # Print current working directory and script location for debugging
     print(f"Current working directory: {os.getcwd()}")
-    print(f"Script location: {os.path.dirname(os.path.abspath(__file__))}")
+    print(f"Script location: {SCRIPT_DIR}")
 
     # Configurations
     # Configurations
@@ -784,17 +1417,24 @@ if __name__ == "__main__":
     discord_notifier = DiscordNotifier(webhook_url, log_webhook_url) if webhook_url else None
     
     # Initialize logger with Discord notifier
-    logger = Logger("log.txt", discord_notifier)
+    logger = Logger(LOG_PATH, discord_notifier)
+    active_logger = logger
     
     # Log startup information
     logger.log_and_print(f"\n{'='*60}")
-    logger.log_and_print(f"Multi-URL Arbitrage Monitor Started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    logger.log_and_print(f"Multi-URL Arbitrage Monitor Started at {_ts()}")
     logger.log_and_print(f"Running from: {os.getcwd()}")
-    logger.log_and_print(f"Script location: {os.path.dirname(os.path.abspath(__file__))}")
+    logger.log_and_print(f"Script location: {SCRIPT_DIR}")
     logger.log_and_print(f"Python executable: {sys.executable}")
     logger.log_and_print(f"Platform: macOS")
     logger.log_and_print(f"{'='*60}")
     
     # Create and run monitor
     monitor = ArbitrageMonitor(urls, price_class, outcome_class, webhook_url, log_webhook_url, CHECK_INTERVAL_MINUTES, logger)
-    monitor.run()
+    active_monitor = monitor
+    try:
+        monitor.run()
+    finally:
+        logger.close()
+        if discord_notifier:
+            discord_notifier.close()